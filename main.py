@@ -3,6 +3,7 @@ import argparse
 import logging
 import yaml
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 
 from src.data import get_sp500_tickers, fetch_stock_data, clean_data, calculate_daily_returns
 from src.analysis import apply_pca, get_principal_components, calculate_portfolio_variance, analyze_pca_risk_factors, calculate_value_at_risk
@@ -34,13 +35,22 @@ def main():
 
     # Step 1: Data Collection and Preprocessing
     logger.info("Starting data collection...")
-    tickers = get_sp500_tickers()  # Fetch ~500 S&P 500 tickers
-    # For performance, optionally limit tickers during testing: tickers = tickers[:50]
-    data = fetch_stock_data(
-        tickers,
-        start_date=config['data']['start_date'],
-        end_date=config['data']['end_date']
-    )
+    # The index download does not depend on the stock universe, so overlap its
+    # network latency with the ticker list and stock data downloads.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        index_future = executor.submit(
+            fetch_index_returns,
+            start_date=config['data']['start_date'],
+            end_date=config['data']['end_date'],
+            index_ticker=config['strategy']['index_ticker']
+        )
+        tickers = get_sp500_tickers()  # Fetch ~500 S&P 500 tickers
+        # For performance, optionally limit tickers during testing: tickers = tickers[:50]
+        data = fetch_stock_data(
+            tickers,
+            start_date=config['data']['start_date'],
+            end_date=config['data']['end_date']
+        )
     cleaned_data = clean_data(
         data,
         fill_method=config['data']['fill_method'],
@@ -59,9 +69,11 @@ def main():
     logger.info("Starting econometric analysis...")
     pca, transformed, explained_variance = apply_pca(
         returns,
-        variance_threshold=config['pca']['variance_threshold']
+        n_components=min(config['pca']['n_components'], *returns.shape),
+        svd_solver=config['pca']['svd_solver'],
+        random_state=config['pca']['random_state']
     )
-    components_df = get_principal_components(pca, returns.columns.tolist())
+    components_df = get_principal_components(pca, returns.columns)
 
     portfolio_vol = calculate_portfolio_variance(returns)
     top_contributors, cumulative_variance = analyze_pca_risk_factors(
@@ -86,11 +98,7 @@ def main():
     basket_weights = create_pca_basket_weights(components_df)
     basket_returns = compute_basket_returns(returns, basket_weights)
 
-    index_returns = fetch_index_returns(
-        start_date=config['data']['start_date'],
-        end_date=config['data']['end_date'],
-        index_ticker=config['strategy']['index_ticker']
-    )
+    index_returns = index_future.result()
 
     spread = compute_spread(basket_returns, index_returns)
     signals = generate_mean_reversion_signals(
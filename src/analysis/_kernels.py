@@ -0,0 +1,28 @@
+# src/analysis/_kernels.py
+import numpy as np
+from typing import Tuple
+
+from ..utils import njit
+
+@njit(cache=True)
+def welford_mean_std(x: np.ndarray) -> Tuple[float, float]:
+    """
+    Compute the mean and sample standard deviation (ddof=1) of a 1-D array in a single pass.
+    Uses Welford's online update, which stays numerically stable without a second pass over the data.
+    
+    Args:
+        x (np.ndarray): 1-D float64 array.
+    
+    Returns:
+        Tuple[float, float]: Mean and sample standard deviation (NaN if fewer than two values).
+    """
+    n = x.shape[0]
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        delta = x[i] - mean
+        mean += delta / (i + 1)
+        m2 += delta * (x[i] - mean)
+    if n < 2:
+        return mean, np.nan
+    return mean, (m2 / (n - 1)) ** 0.5
@@ -3,20 +3,31 @@ import pandas as pd
 import numpy as np
 from sklearn.decomposition import PCA
 from sklearn.linear_model import LinearRegression
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
-def apply_pca(returns: pd.DataFrame, n_components: Optional[int] = None, variance_threshold: Optional[float] = None) -> Tuple[PCA, pd.DataFrame, np.ndarray]:
+def apply_pca(
+    returns: pd.DataFrame,
+    n_components: Optional[int] = None,
+    variance_threshold: Optional[float] = None,
+    svd_solver: str = 'auto',
+    random_state: Optional[int] = None
+) -> Tuple[PCA, pd.DataFrame, np.ndarray]:
     """
     Apply Principal Component Analysis (PCA) as an econometric model to decompose stock returns variance.
     Identifies principal components that capture the primary sources of variation in returns data.
     
+    For risk attribution only the leading components matter, so a small n_components with
+    svd_solver='randomized' avoids computing the full min(dates, stocks) decomposition.
+    
     Args:
         returns (pd.DataFrame): DataFrame of daily returns (rows: dates, columns: stocks).
         n_components (Optional[int], optional): Number of components to keep. Defaults to None.
         variance_threshold (Optional[float], optional): Cumulative variance threshold (e.g., 0.95) to determine n_components. Defaults to None.
+        svd_solver (str, optional): scikit-learn SVD solver ('auto', 'full', 'randomized', ...). Defaults to 'auto'.
+        random_state (Optional[int], optional): Seed for the randomized solver. Defaults to None.
     
     Returns:
         Tuple[PCA, pd.DataFrame, np.ndarray]: Fitted PCA model, transformed data as DataFrame, and explained variance ratios.
@@ -29,13 +40,13 @@ def apply_pca(returns: pd.DataFrame, n_components: Optional[int] = None, varianc
         if n_components is not None and variance_threshold is not None:
             raise ValueError("Provide either n_components or variance_threshold, not both.")
         
-        pca = PCA(n_components=n_components)
+        pca = PCA(n_components=n_components, svd_solver=svd_solver, random_state=random_state)
         transformed = pca.fit_transform(returns)
         
         if variance_threshold is not None:
             cumulative_variance = np.cumsum(pca.explained_variance_ratio_)
             n_components = np.argmax(cumulative_variance >= variance_threshold) + 1
-            pca = PCA(n_components=n_components)
+            pca = PCA(n_components=n_components, svd_solver=svd_solver, random_state=random_state)
             transformed = pca.fit_transform(returns)
         
         transformed_df = pd.DataFrame(
@@ -53,13 +64,14 @@ def apply_pca(returns: pd.DataFrame, n_components: Optional[int] = None, varianc
         logger.error(f"Error applying PCA econometric model: {e}")
         raise
 
-def get_principal_components(pca: PCA, feature_names: list[str]) -> pd.DataFrame:
+def get_principal_components(pca: PCA, feature_names: Union[list[str], pd.Index]) -> pd.DataFrame:
     """
     Extract principal component loadings to interpret econometric drivers of stock returns.
     
     Args:
         pca (PCA): Fitted PCA model.
-        feature_names (list[str]): List of original feature names (e.g., stock tickers).
+        feature_names (Union[list[str], pd.Index]): Original feature names (e.g., stock tickers). Passing
+            returns.columns itself lets the loadings share that Index object.
     
     Returns:
         pd.DataFrame: DataFrame of component loadings (rows: features, columns: components).
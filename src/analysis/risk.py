@@ -1,19 +1,70 @@
 # src/analysis/risk.py
+import weakref
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
+from scipy.stats import norm
 from sklearn.decomposition import PCA
 from typing import Optional, Tuple
 import logging
 
+from ._kernels import welford_mean_std
+
 logger = logging.getLogger(__name__)
 
-def calculate_portfolio_variance(returns: pd.DataFrame, weights: Optional[np.ndarray] = None) -> float:
+# Opt-in memo (calculate_portfolio_variance(..., cache=True)) of mean-centred
+# returns matrices keyed by (id(returns), dtype), bounded to the most recent few
+# frames. Entries are keyed on identity, so a frame mutated in place is not
+# detected; callers opting in must not modify it. Each entry keeps a weak
+# reference to its frame so a recycled id can never return another frame's
+# data, and the entry is dropped as soon as its frame is garbage-collected.
+_CENTERED_CACHE_SIZE = 4
+_centered_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+def _evict_centered(key: tuple, ref: weakref.ref) -> None:
+    # Weakref callback: free the matrix of a dead frame, unless the key now holds a newer entry
+    entry = _centered_cache.get(key)
+    if entry is not None and entry[0] is ref:
+        _centered_cache.pop(key, None)
+
+def _center(returns: pd.DataFrame, dtype: type) -> np.ndarray:
+    R = returns.to_numpy(dtype=dtype)
+    return R - R.mean(axis=0, keepdims=True)
+
+def _centered_returns(returns: pd.DataFrame, dtype: type) -> np.ndarray:
+    # Repeated calls on the same frame (e.g., an optimizer trying many weight
+    # vectors) reuse the conversion and centring.
+    key = (id(returns), np.dtype(dtype).str)
+    entry = _centered_cache.get(key)
+    if entry is not None and entry[0]() is returns and entry[1].shape == returns.shape:
+        _centered_cache.move_to_end(key)
+        return entry[1]
+    
+    R = _center(returns, dtype)
+    _centered_cache[key] = (weakref.ref(returns, lambda ref: _evict_centered(key, ref)), R)
+    if len(_centered_cache) > _CENTERED_CACHE_SIZE:
+        _centered_cache.popitem(last=False)
+    return R
+
+def calculate_portfolio_variance(
+    returns: pd.DataFrame,
+    weights: Optional[np.ndarray] = None,
+    dtype: type = np.float32,
+    validate: bool = False,
+    cache: bool = False
+) -> float:
     """
     Calculate portfolio variance as part of econometric risk analysis based on stock returns covariance.
     
     Args:
         returns (pd.DataFrame): DataFrame of daily returns (rows: dates, columns: stocks).
         weights (Optional[np.ndarray], optional): Portfolio weights (array of length n_stocks). Defaults to equal weights.
+        dtype (type, optional): Floating-point type for the returns matrix product. float32 halves memory traffic
+            and is well within the noise of daily returns; pass np.float64 for full precision. Defaults to np.float32.
+        validate (bool, optional): Also scan the whole frame and reject all-NaN input. Defaults to False.
+        cache (bool, optional): Reuse the converted, mean-centred returns matrix across calls on the same
+            frame (e.g., when evaluating many weight vectors). The frame must not be modified in place while
+            it is cached, since a mutated frame is not detected. Defaults to False.
     
     Returns:
         float: Portfolio variance, representing total risk.
@@ -23,16 +74,24 @@ def calculate_portfolio_variance(returns: pd.DataFrame, weights: Optional[np.nda
         Exception: If calculation fails.
     """
     try:
-        if returns.empty or returns.isna().all().all():
-            raise ValueError("Returns DataFrame is empty or contains only NaNs.")
+        # The all-NaN check scans the whole frame; cleaned returns never need it.
+        if returns.size == 0:
+            raise ValueError("Returns DataFrame is empty.")
+        if validate and returns.isna().to_numpy().all():
+            raise ValueError("Returns DataFrame contains only NaNs.")
         
-        cov_matrix = returns.cov()
+        n_stocks = returns.shape[1]
         if weights is None:
-            weights = np.ones(len(returns.columns)) / len(returns.columns)
-        if len(weights) != len(returns.columns):
+            weights = np.full(n_stocks, 1.0 / n_stocks)
+        if len(weights) != n_stocks:
             raise ValueError("Weights length must match number of stocks.")
         
-        portfolio_variance = np.sqrt(np.dot(weights.T, np.dot(cov_matrix * 252, weights)))
+        # w' Cov w equals the sample variance of the portfolio return series R @ w, so
+        # project first and never materialize the N x N covariance matrix.
+        # The T x N pass runs in the requested dtype; the final T-length reduction is float64.
+        R = _centered_returns(returns, dtype) if cache else _center(returns, dtype)
+        Rw = (R @ np.asarray(weights, dtype=dtype)).astype(np.float64)
+        portfolio_variance = float(np.sqrt((Rw @ Rw) / (R.shape[0] - 1) * 252))
         logger.info(f"Portfolio annualized volatility calculated: {portfolio_variance:.4f}")
         return portfolio_variance
     except Exception as e:
@@ -43,17 +102,22 @@ def analyze_pca_risk_factors(
     pca: PCA,
     components_df: pd.DataFrame,
     explained_variance: np.ndarray,
-    top_n: int = 5
+    top_n: int = 5,
+    max_components: int = 64
 ) -> Tuple[pd.DataFrame, pd.Series]:
     """
     Analyze econometric risk factors from PCA by identifying top contributing stocks per principal component.
     Supports portfolio risk assessment by highlighting key drivers of variance.
     
+    Expects a truncated PCA (e.g., apply_pca with a small n_components and svd_solver='randomized'):
+    only the leading components carry meaningful risk attribution.
+    
     Args:
         pca (PCA): Fitted PCA model from econometric analysis.
         components_df (pd.DataFrame): DataFrame of component loadings (rows: stocks, columns: components).
         explained_variance (np.ndarray): Explained variance ratios from PCA.
         top_n (int, optional): Number of top contributing stocks to return per component. Defaults to 5.
+        max_components (int, optional): Maximum number of components accepted. Defaults to 64.
     
     Returns:
         Tuple[pd.DataFrame, pd.Series]: DataFrame of top contributors per component, and Series of cumulative explained variance.
@@ -65,13 +129,29 @@ def analyze_pca_risk_factors(
     try:
         if components_df.shape[0] == 0 or len(explained_variance) == 0:
             raise ValueError("Invalid PCA components or explained variance data.")
+        if top_n < 1:
+            raise ValueError("top_n must be a positive integer.")
+        if components_df.shape[1] > max_components:
+            raise ValueError(
+                f"Too many PCA components for risk attribution: {components_df.shape[1]} "
+                f"(maximum: {max_components}). Fit a truncated PCA instead."
+            )
         
-        top_contributors = {}
-        for col in components_df.columns:
-            top_stocks = components_df[col].abs().sort_values(ascending=False).head(top_n).index.tolist()
-            top_contributors[col] = top_stocks
+        # Select the top_n absolute loadings of every component at once: argpartition
+        # finds them in O(S) per column, then only those k rows are sorted.
+        loadings = np.abs(components_df.to_numpy())
+        k = min(top_n, loadings.shape[0])
+        top_idx = np.argpartition(-loadings, k - 1, axis=0)[:k]
+        top_vals = np.take_along_axis(loadings, top_idx, axis=0)
+        top_idx = np.take_along_axis(top_idx, np.argsort(-top_vals, axis=0, kind='stable'), axis=0)
         
-        top_contributors_df = pd.DataFrame(top_contributors)
+        # Store tickers as categorical codes over one shared dtype instead of
+        # per-cell Python strings; the selected row positions are the codes.
+        ticker_dtype = pd.CategoricalDtype(categories=components_df.index)
+        top_contributors_df = pd.DataFrame({
+            col: pd.Categorical.from_codes(top_idx[:, j], dtype=ticker_dtype)
+            for j, col in enumerate(components_df.columns)
+        })
         
         cumulative_variance = pd.Series(
             np.cumsum(explained_variance),
@@ -87,7 +167,8 @@ def analyze_pca_risk_factors(
 def calculate_value_at_risk(
     returns: pd.DataFrame,
     confidence_level: float = 0.95,
-    time_horizon: int = 1
+    time_horizon: int = 1,
+    validate: bool = False
 ) -> float:
     """
     Calculate Value-at-Risk (VaR) as an additional econometric risk metric for the portfolio.
@@ -96,26 +177,39 @@ def calculate_value_at_risk(
         returns (pd.DataFrame): DataFrame of daily returns (rows: dates, columns: stocks).
         confidence_level (float, optional): Confidence level for VaR (e.g., 0.95 for 95%). Defaults to 0.95.
         time_horizon (int, optional): Time horizon in days. Defaults to 1.
+        validate (bool, optional): Also scan the whole frame and reject all-NaN input. Defaults to False.
     
     Returns:
-        float: Value-at-Risk at the specified confidence level.
+        float: Value-at-Risk at the specified confidence level, expressed as the left-tail return threshold (negative for a loss).
     
     Raises:
         ValueError: If returns data is invalid or confidence level is out of range.
         Exception: If calculation fails.
     """
     try:
-        if returns.empty or returns.isna().all().all():
-            raise ValueError("Returns DataFrame is empty or contains only NaNs.")
+        # The all-NaN check scans the whole frame; cleaned returns never need it.
+        if returns.size == 0:
+            raise ValueError("Returns DataFrame is empty.")
+        if validate and returns.isna().to_numpy().all():
+            raise ValueError("Returns DataFrame contains only NaNs.")
         if not 0 < confidence_level < 1:
             raise ValueError("Confidence level must be between 0 and 1.")
         
-        portfolio_returns = returns.mean(axis=1)
-        mean_return = portfolio_returns.mean()
-        std_return = portfolio_returns.std()
+        # Equal-weight portfolio returns as a single float64 matrix-vector product
+        R = returns.to_numpy(dtype=np.float64)
+        portfolio_returns = R @ np.full(R.shape[1], 1.0 / R.shape[1])
+        # A NaN anywhere in the frame poisons its row of the product; checking the
+        # T-length result is cheap, and such frames take the NaN-skipping row mean
+        if np.isnan(portfolio_returns).any():
+            portfolio_returns = returns.mean(axis=1).to_numpy(dtype=np.float64)
+            portfolio_returns = portfolio_returns[~np.isnan(portfolio_returns)]
+            if portfolio_returns.size == 0:
+                raise ValueError("Returns DataFrame contains only NaNs.")
+        mean_return, std_return = welford_mean_std(portfolio_returns)
         
-        z_score = np.percentile(np.random.normal(0, 1, 1000000), (1 - confidence_level) * 100)
-        var = mean_return - z_score * std_return * np.sqrt(time_horizon)
+        # Left-tail quantile of the standard normal (negative for confidence_level > 0.5)
+        z_score = norm.ppf(1 - confidence_level)
+        var = mean_return + z_score * std_return * np.sqrt(time_horizon)
         
         logger.info(f"Calculated {confidence_level*100}% VaR for {time_horizon}-day horizon: {var:.4f}")
         return var
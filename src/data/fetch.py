@@ -1,14 +1,96 @@
 # Data Collection and Loading - src/data/fetch.py
+import functools
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 import pandas as pd
 import yfinance as yf
-from typing import List
+from typing import Any, Callable, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+CACHE_DIR = Path(".cache")
+CACHE_TTL_SECONDS = 24 * 60 * 60
+TICKERS_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+SP500_TICKERS_URL = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+
+def _is_empty(result: Any) -> bool:
+    # yfinance reports rate limits and network errors by returning an empty frame
+    # rather than raising, so an empty result is treated as a failed fetch.
+    if result is None:
+        return True
+    empty = getattr(result, 'empty', None)
+    if isinstance(empty, bool):
+        return empty
+    try:
+        return len(result) == 0
+    except TypeError:
+        return False
+
+def cached_fetch(
+    key: tuple,
+    fetch_fn: Callable[[], Any],
+    ttl: float = CACHE_TTL_SECONDS,
+    cache_if: Optional[Callable[[Any], bool]] = None
+) -> Any:
+    """
+    Return the result of fetch_fn, reusing a pickled copy on disk while it is fresher than ttl.
+    Empty results, and results rejected by cache_if, are returned but never written, so a failed
+    download is retried on the next call. Entries live in CACHE_DIR ('.cache/'); delete that
+    directory (or a single '<sha1>.pkl' file in it) to force fresh downloads.
+    
+    Args:
+        key (tuple): Hashable description of the request (e.g., ('stocks', tickers, start, end)).
+        fetch_fn (Callable[[], Any]): Zero-argument function performing the actual download.
+        ttl (float, optional): Maximum age of a cached entry in seconds. Defaults to one day.
+        cache_if (Optional[Callable[[Any], bool]], optional): Predicate deciding whether a non-empty
+            result is complete enough to cache; also applied to entries read back from disk.
+            Defaults to None (cache every non-empty result).
+    
+    Returns:
+        Any: The cached or freshly fetched object.
+    """
+    def cacheable(result: Any) -> bool:
+        return not _is_empty(result) and (cache_if is None or cache_if(result))
+    
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()
+    path = CACHE_DIR / f"{digest}.pkl"
+    if path.exists() and time.time() - path.stat().st_mtime < ttl:
+        try:
+            result = pd.read_pickle(path)
+            if cacheable(result):
+                logger.info(f"Loaded {key[0]} data from cache: {path}")
+                return result
+            logger.warning(f"Ignoring incomplete cache entry {path}")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+    
+    result = fetch_fn()
+    if not cacheable(result):
+        logger.warning(f"Not caching incomplete {key[0]} result; it will be fetched again next time.")
+        return result
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        pd.to_pickle(result, path)
+    except Exception as e:
+        logger.warning(f"Could not write cache entry {path}: {e}")
+    return result
+
+@functools.lru_cache(maxsize=1)
+def _load_sp500_tickers() -> tuple:
+    # The constituent list changes a few times a year, so keep the parsed table
+    # on disk for a week and in memory for the life of the process.
+    return tuple(cached_fetch(
+        ('sp500_tickers', SP500_TICKERS_URL),
+        lambda: pd.read_html(SP500_TICKERS_URL)[0]['Symbol'].tolist(),
+        ttl=TICKERS_CACHE_TTL_SECONDS
+    ))
+
 def get_sp500_tickers() -> List[str]:
     """
-    Fetch the list of current S&P 500 tickers from Wikipedia.
+    Fetch the list of current S&P 500 tickers from Wikipedia, cached on disk for a week.
     
     Returns:
         List[str]: List of S&P 500 stock tickers.
@@ -16,25 +98,58 @@ def get_sp500_tickers() -> List[str]:
     Raises:
         Exception: If fetching the tickers fails.
     """
-    url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
     try:
-        table = pd.read_html(url)[0]
-        tickers = table['Symbol'].tolist()
+        tickers = list(_load_sp500_tickers())
         logger.info(f"Fetched {len(tickers)} S&P 500 tickers.")
         return tickers
     except Exception as e:
         logger.error(f"Error fetching S&P 500 tickers: {e}")
         raise
 
-def fetch_stock_data(tickers: List[str], start_date: str, end_date: str, interval: str = '1d') -> pd.DataFrame:
+def _batches(tickers: List[str], batch_size: int) -> List[List[str]]:
+    return [tickers[i:i + batch_size] for i in range(0, len(tickers), batch_size)]
+
+def _tickers_with_data(data: pd.DataFrame) -> set:
+    # Tickers (first column level) with at least one non-NaN value, in one reduction over the frame
+    all_na = data.isna().all(axis=0).groupby(level=0).all()
+    return set(all_na.index[~all_na.to_numpy()])
+
+def _download_in_batches(tickers: List[str], start_date: str, end_date: str, interval: str, batch_size: int, max_workers: int) -> pd.DataFrame:
+    # One chart request per batch keeps each payload small, so a slow or failing
+    # ticker only stalls its own batch; batches are downloaded concurrently.
+    batches = _batches(tickers, batch_size)
+    
+    def download(batch: List[str], threads: bool = False) -> pd.DataFrame:
+        return yf.download(
+            batch, start=start_date, end=end_date, interval=interval, group_by='ticker',
+            auto_adjust=True, actions=False, threads=threads, progress=False
+        )
+    
+    if len(batches) <= 1:
+        return download(tickers, threads=True)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+        parts = list(executor.map(download, batches))
+    return pd.concat(parts, axis=1)
+
+def fetch_stock_data(
+    tickers: List[str],
+    start_date: str,
+    end_date: str,
+    interval: str = '1d',
+    batch_size: int = 50,
+    max_workers: int = 8
+) -> pd.DataFrame:
     """
     Fetch historical stock data for given tickers using yfinance, filtering out invalid tickers.
+    Tickers are downloaded concurrently in batches of batch_size.
     
     Args:
         tickers (List[str]): List of stock tickers.
         start_date (str): Start date in 'YYYY-MM-DD' format.
         end_date (str): End date in 'YYYY-MM-DD' format.
         interval (str, optional): Data interval (e.g., '1d' for daily). Defaults to '1d'.
+        batch_size (int, optional): Number of tickers per download request. Defaults to 50.
+        max_workers (int, optional): Maximum number of concurrent batch downloads. Defaults to 8.
     
     Returns:
         pd.DataFrame: Multi-index DataFrame with stock data for valid tickers.
@@ -43,13 +158,23 @@ def fetch_stock_data(tickers: List[str], start_date: str, end_date: str, interva
         Exception: If data fetching fails or no valid data is returned.
     """
     try:
-        data = yf.download(tickers, start=start_date, end=end_date, interval=interval, group_by='ticker', auto_adjust=True)
+        # A batch with no data at all is a failed request rather than a set of delisted
+        # tickers, so such a partial download is not cached
+        def all_batches_returned(result: pd.DataFrame) -> bool:
+            available = _tickers_with_data(result)
+            return all(any(ticker in available for ticker in batch) for batch in _batches(tickers, batch_size))
+        
+        data = cached_fetch(
+            ('stocks', tuple(tickers), start_date, end_date, interval),
+            lambda: _download_in_batches(tickers, start_date, end_date, interval, batch_size, max_workers),
+            cache_if=all_batches_returned
+        )
+        if data.empty:
+            raise ValueError("No valid ticker data retrieved.")
         
         # Check for valid tickers (non-empty data)
-        valid_tickers = []
-        for ticker in tickers:
-            if ticker in data.columns.get_level_values(0) and not data[ticker].isna().all().all():
-                valid_tickers.append(ticker)
+        available = _tickers_with_data(data)
+        valid_tickers = [ticker for ticker in tickers if ticker in available]
         
         if not valid_tickers:
             raise ValueError("No valid ticker data retrieved.")
@@ -6,6 +6,23 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+def _fill_missing_inplace(df: pd.DataFrame, fill_method: str) -> None:
+    # fillna(method=...) is deprecated; dispatch to the dedicated in-place fillers.
+    if fill_method in ('ffill', 'pad'):
+        df.ffill(inplace=True)
+    elif fill_method in ('bfill', 'backfill'):
+        df.bfill(inplace=True)
+    else:
+        raise ValueError(f"Unsupported fill_method '{fill_method}': expected 'ffill' or 'bfill'.")
+
+def _drop_nan_rows(df: pd.DataFrame) -> pd.DataFrame:
+    # For all-float frames, one isnan pass over the underlying array is cheaper than
+    # DataFrame.dropna's block-wise path, and nothing is copied when no row has NaNs.
+    if df.shape[1] == 0 or not all(pd.api.types.is_float_dtype(dtype) for dtype in df.dtypes):
+        return df.dropna(how='any')
+    mask = ~np.isnan(df.to_numpy()).any(axis=1)
+    return df if mask.all() else df.iloc[mask]
+
 def clean_data(df: pd.DataFrame, fill_method: Optional[str] = 'ffill', dropna: bool = True, min_valid_tickers: int = 10, price_col: str = 'Close', max_na_ratio: float = 0.1) -> pd.DataFrame:
     """
     Clean stock data by handling missing values and infinite values.
@@ -30,26 +47,30 @@ def clean_data(df: pd.DataFrame, fill_method: Optional[str] = 'ffill', dropna: b
         if isinstance(df.columns, pd.MultiIndex):
             if price_col not in df.columns.levels[1]:
                 raise ValueError(f"Price column '{price_col}' not found in DataFrame columns: {df.columns.levels[1]}")
-            df = df.xs(price_col, level=1, axis=1, drop_level=True)
+            df = df.xs(price_col, level=1, axis=1, drop_level=True).copy()
+        else:
+            df = df.copy()
         
-        # Replace infinite values
-        df = df.replace([np.inf, -np.inf], np.nan)
+        # Work on the single copy above in place: replace infinite values first so
+        # they are filled like any other gap rather than carried forward.
+        df.replace([np.inf, -np.inf], np.nan, inplace=True)
         
         # Drop columns with too many NaNs
         na_ratio = df.isna().mean()
-        valid_columns = na_ratio[na_ratio <= max_na_ratio].index
-        df = df[valid_columns]
+        invalid_columns = na_ratio.index[na_ratio > max_na_ratio]
+        if len(invalid_columns) > 0:
+            df.drop(columns=invalid_columns, inplace=True)
         
         if df.shape[1] < min_valid_tickers:
             raise ValueError(f"Too few valid tickers after NaN filtering: {df.shape[1]} (minimum required: {min_valid_tickers})")
         
         # Fill missing values
         if fill_method:
-            df = df.fillna(method=fill_method)
+            _fill_missing_inplace(df, fill_method)
         
         # Drop any remaining NaN rows if dropna is True
         if dropna:
-            df = df.dropna(how='any')
+            df = _drop_nan_rows(df)
         
         if df.empty:
             raise ValueError("Cleaned DataFrame is empty after processing.")
@@ -82,22 +103,22 @@ def clean_index_data(df: pd.DataFrame, fill_method: Optional[str] = 'ffill', dro
         if isinstance(df.columns, pd.MultiIndex):
             if price_col not in df.columns.levels[1]:
                 raise ValueError(f"Price column '{price_col}' not found in DataFrame columns: {df.columns.levels[1]}")
-            df = df.xs(price_col, level=1, axis=1, drop_level=True)
+            df = df.xs(price_col, level=1, axis=1, drop_level=True).copy()
         elif price_col in df.columns:
-            df = df[[price_col]]
+            df = df[[price_col]].copy()
         else:
             raise ValueError(f"Price column '{price_col}' not found in DataFrame columns: {df.columns}")
         
         # Replace infinite values
-        df = df.replace([np.inf, -np.inf], np.nan)
+        df.replace([np.inf, -np.inf], np.nan, inplace=True)
         
         # Fill missing values
         if fill_method:
-            df = df.fillna(method=fill_method)
+            _fill_missing_inplace(df, fill_method)
         
         # Drop any remaining NaN rows if dropna is True
         if dropna:
-            df = df.dropna(how='any')
+            df = _drop_nan_rows(df)
         
         if df.empty:
             raise ValueError("Cleaned index DataFrame is empty after processing.")
@@ -108,24 +129,27 @@ def clean_index_data(df: pd.DataFrame, fill_method: Optional[str] = 'ffill', dro
         logger.error(f"Error cleaning index data: {e}")
         raise
 
-def calculate_daily_returns(df: pd.DataFrame, price_col: Optional[str] = None) -> pd.DataFrame:
+def calculate_daily_returns(df: pd.DataFrame, price_col: Optional[str] = None, method: str = 'simple') -> pd.DataFrame:
     """
     Calculate daily returns from stock or index price data.
     
     Args:
         df (pd.DataFrame): DataFrame with prices (tickers as columns or multi-index with price_col).
         price_col (Optional[str], optional): Column name for prices if multi-index. Defaults to None.
+        method (str, optional): 'simple' for arithmetic returns or 'log' for log-returns. Defaults to 'simple'.
     
     Returns:
         pd.DataFrame: DataFrame with daily returns (tickers as columns).
     
     Raises:
-        ValueError: If DataFrame is empty or invalid.
+        ValueError: If DataFrame is empty or invalid, or method is not 'simple' or 'log'.
         Exception: If calculation fails.
     """
     try:
         if df.empty:
             raise ValueError("Input DataFrame is empty.")
+        if method not in ('simple', 'log'):
+            raise ValueError(f"Unsupported returns method '{method}': expected 'simple' or 'log'.")
         
         # If DataFrame is already single-level (tickers as columns), use it directly
         if not isinstance(df.columns, pd.MultiIndex):
@@ -136,11 +160,23 @@ def calculate_daily_returns(df: pd.DataFrame, price_col: Optional[str] = None) -
                 raise ValueError("price_col must be specified for multi-index DataFrame.")
             prices = df.xs(price_col, level=1, axis=1, drop_level=True)
         
-        # Replace zeros with NaN to avoid invalid pct_change results
-        prices = prices.replace(0, np.nan)
-        
-        # Calculate returns and drop rows with any NaNs
-        returns = prices.pct_change().dropna(how='any')
+        # Replace zeros with NaN to avoid invalid returns, then forward-fill the gaps
+        # (as pct_change does) so a missing price only flattens that day's return
+        # instead of dropping that date and the next one for every stock
+        P = prices.to_numpy(dtype=np.float64, copy=True)
+        P[P == 0] = np.nan
+        missing = np.isnan(P)
+        if missing.any():
+            last_valid = np.where(missing, 0, np.arange(P.shape[0])[:, None])
+            np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+            P = P[last_valid, np.arange(P.shape[1])]
+        
+        # Calculate returns in one pass over the array and drop rows with any NaNs
+        if method == 'log':
+            R = np.diff(np.log(P), axis=0)
+        else:
+            R = P[1:] / P[:-1] - 1
+        returns = pd.DataFrame(R, index=prices.index[1:], columns=prices.columns).dropna(how='any')
         
         if returns.empty:
             raise ValueError("Returns DataFrame is empty after calculation.")
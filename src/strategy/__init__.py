@@ -5,8 +5,10 @@ from .trading import (
     fetch_index_returns,
     compute_spread,
     generate_mean_reversion_signals,
-    backtest_strategy
+    backtest_strategy,
+    batch_backtest
 )
+from .parallel import run_parallel_backtests
 
 __all__ = [
     'create_pca_basket_weights',
@@ -14,5 +16,7 @@ __all__ = [
     'fetch_index_returns',
     'compute_spread',
     'generate_mean_reversion_signals',
-    'backtest_strategy'
+    'backtest_strategy',
+    'batch_backtest',
+    'run_parallel_backtests'
 ]
\ No newline at end of file
@@ -0,0 +1,156 @@
+# src/strategy/parallel.py
+import multiprocessing
+import os
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from ..data.fetch import fetch_stock_data
+from ..data.preprocess import clean_data, calculate_daily_returns
+from .trading import fetch_index_returns, compute_spread, generate_mean_reversion_signals, backtest_strategy
+
+logger = logging.getLogger(__name__)
+
+def _backtest_ticker(
+    ticker: str,
+    stock_returns: pd.Series,
+    index_returns: pd.Series,
+    window: int,
+    entry_z: float,
+    exit_z: float,
+    transaction_cost: float,
+    risk_free_rate: float
+) -> Tuple[str, pd.Series, float, float]:
+    # Module-level so it can be pickled to worker processes. Each ticker's own
+    # timeline stays sequential; only independent tickers run in parallel.
+    stock_returns, index_returns = stock_returns.align(index_returns, join='inner')
+    spread = compute_spread(stock_returns, index_returns)
+    signals = generate_mean_reversion_signals(spread, window=window, entry_z=entry_z, exit_z=exit_z)
+    cumulative_returns, sharpe, max_drawdown = backtest_strategy(
+        spread,
+        signals,
+        transaction_cost=transaction_cost,
+        risk_free_rate=risk_free_rate
+    )
+    return ticker, cumulative_returns, sharpe, max_drawdown
+
+def _backtest_batch(
+    stock_returns: pd.DataFrame,
+    index_returns: pd.Series,
+    window: int,
+    entry_z: float,
+    exit_z: float,
+    transaction_cost: float,
+    risk_free_rate: float
+) -> List[Tuple[str, Optional[pd.Series], float, float, Optional[str]]]:
+    # Backtest every column of stock_returns in turn. One task covers many tickers, so
+    # the per-task pickling and scheduling cost is paid per batch; a failing ticker is
+    # reported with its error instead of failing the whole batch.
+    results = []
+    for ticker in stock_returns.columns:
+        try:
+            _, cumulative_returns, sharpe, max_drawdown = _backtest_ticker(
+                ticker, stock_returns[ticker], index_returns,
+                window, entry_z, exit_z, transaction_cost, risk_free_rate
+            )
+            results.append((ticker, cumulative_returns, sharpe, max_drawdown, None))
+        except Exception as e:
+            results.append((ticker, None, float('nan'), float('nan'), str(e)))
+    return results
+
+def run_parallel_backtests(
+    tickers: List[str],
+    start_date: str,
+    end_date: str,
+    window: int = 20,
+    entry_z: float = 2.0,
+    exit_z: float = 0.5,
+    transaction_cost: float = 0.001,
+    risk_free_rate: float = 0.0,
+    index_ticker: str = '^GSPC',
+    max_workers: Optional[int] = None,
+    min_parallel_tickers: int = 20000
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Backtest the mean-reversion strategy on each ticker's spread against the index, spreading large
+    universes over worker processes in one batch of tickers per worker.
+    Prices and index returns are downloaded once in the parent; workers only run the CPU-bound
+    spread -> signals -> backtest steps. A failing ticker is logged and skipped.
+    
+    Worker processes are started with the 'spawn' method: forking a parent whose numba thread pool is
+    running (e.g., after batch_backtest) leaves the process unable to exit. Spawned workers
+    re-import this module, so scripts calling this function need an `if __name__ == '__main__':` guard.
+    
+    Args:
+        tickers (List[str]): List of stock tickers.
+        start_date (str): Start date in 'YYYY-MM-DD' format.
+        end_date (str): End date in 'YYYY-MM-DD' format.
+        window (int, optional): Rolling window for the spread z-score. Defaults to 20.
+        entry_z (float, optional): Z-score threshold for entry. Defaults to 2.0.
+        exit_z (float, optional): Z-score threshold for exit. Defaults to 0.5.
+        transaction_cost (float, optional): Cost per trade (as fraction). Defaults to 0.001.
+        risk_free_rate (float, optional): Annual risk-free rate. Defaults to 0.0.
+        index_ticker (str, optional): Ticker for the index (e.g., '^GSPC' for S&P 500). Defaults to '^GSPC'.
+        max_workers (Optional[int], optional): Number of worker processes. Defaults to os.cpu_count().
+        min_parallel_tickers (int, optional): Below this many tickers the backtests run serially in this
+            process; a single compiled backtest takes well under a millisecond, so starting worker
+            processes only pays off for very large universes. Defaults to 20000.
+    
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: Cumulative returns per ticker (columns: tickers), and a summary
+        with 'Sharpe Ratio' and 'Max Drawdown' per ticker (rows: tickers).
+    
+    Raises:
+        ValueError: If no ticker could be backtested.
+        Exception: If data fetching or preprocessing fails.
+    """
+    try:
+        index_returns = fetch_index_returns(start_date, end_date, index_ticker=index_ticker)
+        data = fetch_stock_data(tickers, start_date=start_date, end_date=end_date)
+        returns = calculate_daily_returns(clean_data(data, min_valid_tickers=1), price_col=None)
+        
+        args = (index_returns, window, entry_z, exit_z, transaction_cost, risk_free_rate)
+        n_workers = min(max_workers or os.cpu_count() or 1, returns.shape[1])
+        outcomes = []
+        if returns.shape[1] < min_parallel_tickers or n_workers <= 1:
+            outcomes = _backtest_batch(returns, *args)
+        else:
+            # One contiguous batch of tickers per worker
+            bounds = [returns.shape[1] * i // n_workers for i in range(n_workers + 1)]
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            ) as executor:
+                futures = {
+                    executor.submit(_backtest_batch, returns.iloc[:, lo:hi], *args): (lo, hi)
+                    for lo, hi in zip(bounds[:-1], bounds[1:])
+                }
+                for future in as_completed(futures):
+                    lo, hi = futures[future]
+                    try:
+                        outcomes.extend(future.result())
+                    except Exception as e:
+                        logger.warning(f"Backtest worker failed for tickers {list(returns.columns[lo:hi])}: {e}")
+        
+        cumulative: Dict[str, pd.Series] = {}
+        summary: Dict[str, dict] = {}
+        for ticker, cumulative_returns, sharpe, max_drawdown, error in outcomes:
+            if error is not None:
+                logger.warning(f"Backtest failed for {ticker}: {error}")
+                continue
+            cumulative[ticker] = cumulative_returns
+            summary[ticker] = {'Sharpe Ratio': sharpe, 'Max Drawdown': max_drawdown}
+        
+        if not cumulative:
+            raise ValueError("No ticker could be backtested.")
+        
+        completed = [ticker for ticker in returns.columns if ticker in cumulative]
+        cumulative_df = pd.DataFrame(cumulative)[completed]
+        summary_df = pd.DataFrame.from_dict(summary, orient='index').loc[completed]
+        
+        logger.info(f"Backtests completed for {len(completed)} of {returns.shape[1]} tickers.")
+        return cumulative_df, summary_df
+    except Exception as e:
+        logger.error(f"Error running parallel backtests: {e}")
+        raise
@@ -1,16 +1,201 @@
 # src/strategy/trading.py
+import functools
 import pandas as pd
 import numpy as np
-from typing import Tuple, Optional
+from typing import Sequence, Tuple, Optional, Union
 import logging
 import yfinance as yf
 
-from ..data.fetch import fetch_stock_data
+from ..data.fetch import fetch_stock_data, cached_fetch
 from ..data.preprocess import clean_data, calculate_daily_returns, clean_index_data
 from ..analysis.pca import PCA  # For type hinting, assuming PCA from sklearn
+from ..utils import njit, prange, NUMBA_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
+@njit(cache=True)
+def _mean_reversion_fused(x: np.ndarray, window: int, entry_z: float, exit_z: float) -> np.ndarray:
+    # Rolling z-score and position state machine fused into one pass over the spread;
+    # only the scalar window statistics and the int8 signals are ever stored.
+    #
+    # The window keeps its valid count, mean and sum of squared deviations with
+    # Welford's add/remove updates, matching spread.rolling(window).mean()/.std():
+    # z is undefined until the window holds `window` valid values, and for a
+    # constant window (detected from the run of identical values, as pandas does,
+    # since the running sum of squares only cancels to approximately zero).
+    n = x.shape[0]
+    signals = np.zeros(n, dtype=np.int8)
+    position = 0
+    nobs = 0
+    mean = 0.0
+    ssqdm = 0.0
+    prev_val = np.nan
+    same_run = 0
+    for i in range(n):
+        val = x[i]
+        if not np.isnan(val):
+            same_run = same_run + 1 if val == prev_val else 1
+            prev_val = val
+            nobs += 1
+            delta = val - mean
+            mean += delta / nobs
+            ssqdm += delta * (val - mean)
+        if i >= window:
+            old = x[i - window]
+            if not np.isnan(old):
+                nobs -= 1
+                if nobs > 0:
+                    delta = old - mean
+                    mean -= delta / nobs
+                    ssqdm -= delta * (old - mean)
+                else:
+                    mean = 0.0
+                    ssqdm = 0.0
+        if nobs < window or window < 2 or same_run >= window or ssqdm <= 0.0:
+            continue
+        z = (val - mean) / np.sqrt(ssqdm / (window - 1))
+        
+        if position == 0:
+            if z > entry_z:
+                signals[i] = -1
+                position = -1
+            elif z < -entry_z:
+                signals[i] = 1
+                position = 1
+        elif position == 1:
+            if z > -exit_z:
+                signals[i] = -1  # Exit by closing (signal to adjust)
+                position = 0
+        elif position == -1:
+            if z < exit_z:
+                signals[i] = 1  # Exit
+                position = 0
+    return signals
+
+def _mean_reversion_vectorized(z: np.ndarray, entry_z: float, exit_z: float) -> np.ndarray:
+    # NumPy formulation of the same state machine for installs without numba, where
+    # _mean_reversion_fused runs as a Python loop. Requires 0 < exit_z <= entry_z.
+    #
+    # NaN bars leave the position unchanged, so work on the valid bars only. Each bar
+    # is on the long side (z <= -exit_z), the short side (z >= exit_z) or neutral.
+    # A position only lives inside a run of same-side bars: it opens on the first
+    # entry trigger of the run and closes on the first bar after the run. The one
+    # coupling between runs is that a run starting right where an opened run of the
+    # other side ends spends its first bar on that exit, so it cannot enter there.
+    signals = np.zeros(z.shape[0], dtype=np.int8)
+    valid = np.flatnonzero(~np.isnan(z))
+    m = valid.shape[0]
+    if m == 0:
+        return signals
+    zv = z[valid]
+    side = np.where(zv <= -exit_z, 1, np.where(zv >= exit_z, -1, 0)).astype(np.int8)
+    trigger = (zv < -entry_z) | (zv > entry_z)
+    
+    change = np.ones(m, dtype=bool)
+    change[1:] = side[1:] != side[:-1]
+    seg_starts = np.flatnonzero(change)
+    seg_ends = np.append(seg_starts[1:], m) - 1
+    in_run = side[seg_starts] != 0
+    starts, ends = seg_starts[in_run], seg_ends[in_run]
+    n_runs = starts.shape[0]
+    if n_runs == 0:
+        return signals
+    run_side = side[starts]
+    
+    trig_count = np.concatenate(([0], np.cumsum(trigger)))  # triggers before each bar
+    first = trigger[starts]
+    rest = trig_count[ends + 1] - trig_count[starts + 1] > 0
+    adjacent = np.zeros(n_runs, dtype=bool)
+    adjacent[1:] = starts[1:] == ends[:-1] + 1
+    
+    # A run whose only trigger is its first bar, directly after an opposite run, is
+    # opened exactly when that run was not; every other run opens iff it has a
+    # trigger. Resolve the chains by parity from the last independent run.
+    dependent = first & ~rest & adjacent
+    positions = np.arange(n_runs)
+    last_independent = np.maximum.accumulate(np.where(dependent, 0, positions))
+    opened = (first | rest)[last_independent] ^ ((positions - last_independent) % 2 == 1)
+    blocked = np.zeros(n_runs, dtype=bool)
+    blocked[1:] = adjacent[1:] & opened[:-1]
+    
+    # Entry on the first trigger the run can use, exit on the bar after the run
+    search_from = starts[opened] + blocked[opened]
+    entries = np.searchsorted(trig_count[1:], trig_count[search_from] + 1)
+    exits = ends[opened] + 1
+    has_exit = exits < m
+    signals[valid[entries]] = run_side[opened]
+    signals[valid[exits[has_exit]]] = -run_side[opened][has_exit]
+    return signals
+
+@njit(cache=True)
+def _bt_core(
+    sig: np.ndarray,
+    x: np.ndarray,
+    transaction_cost: float,
+    risk_free_rate: float
+) -> Tuple[np.ndarray, float, float]:
+    # The whole backtest in one pass with scalar accumulators: returns of the previous
+    # bar's signal less costs on signal changes (none on the first bar), the running
+    # product, Welford mean/std (ddof=1) for the Sharpe ratio, and the running peak for
+    # the drawdown. NaN bars stay NaN in the cumulative returns and are skipped by the
+    # statistics, as the pandas reductions do.
+    n = x.shape[0]
+    cumulative = np.empty(n)
+    count = 0
+    mean = 0.0
+    ssqdm = 0.0
+    running = 1.0
+    peak = -np.inf
+    max_drawdown = np.nan
+    prev = 0.0
+    for t in range(n):
+        r = prev * x[t]
+        if t > 0:
+            r -= abs(sig[t] - prev) * transaction_cost
+        prev = sig[t]
+        if np.isnan(r):
+            cumulative[t] = np.nan
+            continue
+        count += 1
+        delta = r - mean
+        mean += delta / count
+        ssqdm += delta * (r - mean)
+        running *= 1.0 + r
+        cumulative[t] = running
+        if running > peak:
+            peak = running
+        drawdown = (running - peak) / peak
+        if not drawdown >= max_drawdown:
+            max_drawdown = drawdown
+    std_ret = np.sqrt(ssqdm / (count - 1)) * np.sqrt(252.0) if count > 1 else np.nan
+    sharpe = (mean * 252.0 - risk_free_rate) / std_ret if std_ret != 0 else 0.0
+    return cumulative, sharpe, max_drawdown
+
+@njit(parallel=True, cache=True)
+def _batch_backtest_kernel(
+    x: np.ndarray,
+    windows: np.ndarray,
+    entry_zs: np.ndarray,
+    exit_zs: np.ndarray,
+    transaction_cost: float,
+    risk_free_rate: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    # One independent signals + backtest run per (window, entry_z, exit_z) combination,
+    # spread over the cores.
+    n_entry = entry_zs.shape[0]
+    n_exit = exit_zs.shape[0]
+    n_combos = windows.shape[0] * n_entry * n_exit
+    sharpe = np.empty(n_combos)
+    max_drawdown = np.empty(n_combos)
+    for k in prange(n_combos):
+        signals = _mean_reversion_fused(
+            x, windows[k // (n_entry * n_exit)], entry_zs[(k // n_exit) % n_entry], exit_zs[k % n_exit]
+        )
+        _, combo_sharpe, combo_drawdown = _bt_core(signals, x, transaction_cost, risk_free_rate)
+        sharpe[k] = combo_sharpe
+        max_drawdown[k] = combo_drawdown
+    return sharpe, max_drawdown
+
 def create_pca_basket_weights(components_df: pd.DataFrame) -> pd.Series:
     """
     Create portfolio weights based on the first principal component loadings.
@@ -20,7 +205,7 @@ def create_pca_basket_weights(components_df: pd.DataFrame) -> pd.Series:
         components_df (pd.DataFrame): DataFrame of PCA component loadings (from get_principal_components).
     
     Returns:
-        pd.Series: Normalized weights for the PCA basket (sum to 1 in absolute terms to handle longs/shorts).
+        pd.Series: Normalized float32 weights for the PCA basket (sum to 1 in absolute terms to handle longs/shorts).
     
     Raises:
         ValueError: If 'PC1' column is missing or DataFrame is empty.
@@ -30,7 +215,8 @@ def create_pca_basket_weights(components_df: pd.DataFrame) -> pd.Series:
         if 'PC1' not in components_df.columns or components_df.empty:
             raise ValueError("Components DataFrame must contain 'PC1' column and not be empty.")
         
-        weights = components_df['PC1']
+        # Loadings estimated from noisy daily returns carry no more precision than float32
+        weights = components_df['PC1'].astype(np.float32)
         weights = weights / weights.abs().sum()  # Normalize to unit exposure
         logger.info("PCA basket weights created successfully.")
         return weights
@@ -38,35 +224,66 @@ def create_pca_basket_weights(components_df: pd.DataFrame) -> pd.Series:
         logger.error(f"Error creating PCA basket weights: {e}")
         raise
 
-def compute_basket_returns(returns: pd.DataFrame, weights: pd.Series) -> pd.Series:
+def compute_basket_returns(returns: pd.DataFrame, weights: pd.Series, dtype: type = np.float32) -> pd.Series:
     """
     Compute the returns of the PCA-based basket portfolio.
     
     Args:
         returns (pd.DataFrame): DataFrame of stock daily returns.
         weights (pd.Series): Portfolio weights aligned with returns columns.
+        dtype (type, optional): Floating-point type for the returns matrix product. float32 halves memory traffic
+            and is well within the noise of daily returns; pass np.float64 for full precision. Defaults to np.float32.
     
     Returns:
-        pd.Series: Time series of basket returns.
+        pd.Series: Time series of basket returns (float64).
     
     Raises:
         ValueError: If weights and returns columns do not match.
         Exception: If computation fails.
     """
     try:
-        if not returns.columns.equals(weights.index):
+        # Weights derived from get_principal_components(pca, returns.columns) share the
+        # returns' column Index, so the O(N) label comparison is usually skipped
+        if returns.columns is not weights.index and not returns.columns.equals(weights.index):
             raise ValueError("Weights index must match returns columns.")
         
-        basket_returns = returns.dot(weights)
+        # Alignment is already established, so skip DataFrame.dot's reindexing and go
+        # straight to a contiguous matrix-vector product. The T-length result is widened
+        # to float64 so the spread statistics downstream do not lose precision.
+        R = np.ascontiguousarray(returns.to_numpy(dtype=dtype))
+        w = np.ascontiguousarray(weights.to_numpy(dtype=dtype))
+        basket_returns = pd.Series((R @ w).astype(np.float64), index=returns.index, name='basket')
         logger.info("Basket returns computed successfully.")
         return basket_returns
     except Exception as e:
         logger.error(f"Error computing basket returns: {e}")
         raise
 
+@functools.lru_cache(maxsize=32)
+def _fetch_index_returns_cached(start_date: str, end_date: str, index_ticker: str) -> pd.Series:
+    # Parameter sweeps over the same date range ask for the same index series
+    # repeatedly; the disk cache spares the download, this spares the unpickle
+    # and cleaning. Every caller shares the returned Series, so it is read-only.
+    index_data = cached_fetch(
+        ('index', index_ticker, start_date, end_date),
+        lambda: yf.download(index_ticker, start=start_date, end=end_date, auto_adjust=True, actions=False, progress=False)
+    )
+    logger.info(f"Stock data fetched successfully for {index_ticker}.")
+    
+    # Clean index data
+    cleaned = clean_index_data(index_data, price_col='Close')
+    
+    # Calculate daily returns
+    returns = calculate_daily_returns(cleaned, price_col=None)
+    
+    # Convert to Series (single ticker)
+    return returns.squeeze()
+
 def fetch_index_returns(start_date: str, end_date: str, index_ticker: str = '^GSPC') -> pd.Series:
     """
     Fetch historical index data and calculate daily returns for the specified index.
+    Results are memoized per (start_date, end_date, index_ticker); the returned Series
+    is shared between callers and must not be modified in place.
     
     Args:
         start_date (str): Start date in 'YYYY-MM-DD' format.
@@ -74,25 +291,17 @@ def fetch_index_returns(start_date: str, end_date: str, index_ticker: str = '^GS
         index_ticker (str, optional): Ticker for the index (e.g., '^GSPC' for S&P 500). Defaults to '^GSPC'.
     
     Returns:
-        pd.Series: Daily returns for the index.
+        pd.Series: Daily returns for the index (read-only).
     
     Raises:
         Exception: If data fetching or processing fails.
     """
     try:
-        index_data = yf.download(index_ticker, start=start_date, end=end_date, auto_adjust=True)
-        logger.info(f"Stock data fetched successfully for {index_ticker}.")
-        
-        # Clean index data
-        cleaned = clean_index_data(index_data, price_col='Close')
-        
-        # Calculate daily returns
-        returns = calculate_daily_returns(cleaned, price_col=None)
-        
-        # Convert to Series (single ticker)
-        returns = returns.squeeze()
+        returns = _fetch_index_returns_cached(start_date, end_date, index_ticker)
         
-        logger.info(f"Index returns calculated: {len(returns)} days for {index_ticker}.")
+        # Memoized calls sit on the sweep path; only format the message when it is emitted
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Index returns calculated: {len(returns)} days for {index_ticker}.")
         return returns
     except Exception as e:
         logger.error(f"Error fetching index returns: {e}")
@@ -155,30 +364,17 @@ def generate_mean_reversion_signals(
         if window <= 0 or len(spread) < window:
             raise ValueError("Window must be positive and less than spread length.")
         
-        rolling_mean = spread.rolling(window).mean()
-        rolling_std = spread.rolling(window).std()
-        z_score = (spread - rolling_mean) / rolling_std
-        
-        signals = pd.Series(0, index=spread.index)
-        position = 0
-        
-        for i in range(len(z_score)):
-            z = z_score.iloc[i]
-            if position == 0:
-                if z > entry_z:
-                    signals.iloc[i] = -1
-                    position = -1
-                elif z < -entry_z:
-                    signals.iloc[i] = 1
-                    position = 1
-            elif position == 1:
-                if z > -exit_z:
-                    signals.iloc[i] = -1  # Exit by closing (signal to adjust)
-                    position = 0
-            elif position == -1:
-                if z < exit_z:
-                    signals.iloc[i] = 1  # Exit
-                    position = 0
+        # The position state depends on the previous bar, so the rolling z-score and the
+        # state machine run together in one compiled pass without intermediate arrays.
+        # Without numba that pass is a Python loop; use the NumPy formulation instead
+        # whenever the thresholds allow it.
+        if NUMBA_AVAILABLE or not 0 < exit_z <= entry_z:
+            values = _mean_reversion_fused(spread.to_numpy(dtype=np.float64), int(window), float(entry_z), float(exit_z))
+        else:
+            rolling = spread.rolling(window)
+            z_score = ((spread - rolling.mean()) / rolling.std()).to_numpy(dtype=np.float64)
+            values = _mean_reversion_vectorized(z_score, float(entry_z), float(exit_z))
+        signals = pd.Series(values, index=spread.index)
         
         logger.info("Mean-reversion signals generated.")
         return signals
@@ -186,6 +382,42 @@ def generate_mean_reversion_signals(
         logger.error(f"Error generating signals: {e}")
         raise
 
+def _bt_numpy(sig: np.ndarray, x: np.ndarray, transaction_cost: float, risk_free_rate: float) -> Tuple[np.ndarray, float, float]:
+    # NumPy version of _bt_core for installs without numba, where the kernel would run
+    # as a Python loop.
+    #
+    # Portfolio returns = previous signal * spread, less transaction costs on position
+    # changes; the previous-signal array gives both in one pass (no cost on the first bar)
+    prev = np.empty_like(sig)
+    prev[:1] = 0.0
+    prev[1:] = sig[:-1]
+    position_changes = np.abs(sig - prev)
+    position_changes[:1] = 0.0
+    r = prev * x - position_changes * transaction_cost
+    
+    # Compound as a sum of log returns; cumsum vectorizes better than cumprod and
+    # accumulates less rounding error over long horizons. A return of -100% or
+    # worse has no logarithm, so that case keeps the plain product.
+    if (r > -1).all():
+        cr = np.exp(np.cumsum(np.log1p(r)))
+    else:
+        cr = pd.Series(1 + r).cumprod().to_numpy()
+    
+    # Check for NaNs once: dense returns (the usual case) take the plain reductions,
+    # otherwise the NaN-skipping ones reproduce the pandas semantics
+    dense = not np.isnan(r).any()
+    
+    # Sharpe ratio (annualized)
+    mean_ret = (r.mean() if dense else np.nanmean(r)) * 252
+    std_ret = (r.std(ddof=1) if dense else np.nanstd(r, ddof=1)) * np.sqrt(252)
+    sharpe = (mean_ret - risk_free_rate) / std_ret if std_ret != 0 else 0.0
+    
+    # Max drawdown
+    peak = np.maximum.accumulate(cr) if dense else np.fmax.accumulate(cr)
+    drawdown = (cr - peak) / peak
+    max_drawdown = drawdown.min() if dense else np.nanmin(drawdown)
+    return cr, sharpe, max_drawdown
+
 def backtest_strategy(
     spread: pd.Series,
     signals: pd.Series,
@@ -212,27 +444,70 @@ def backtest_strategy(
         if not spread.index.equals(signals.index):
             raise ValueError("Spread and signals must have matching indices.")
         
-        # Portfolio returns = signals.shift(1) * spread
-        portfolio_returns = signals.shift(1).fillna(0) * spread
-        
-        # Apply transaction costs on position changes
-        position_changes = signals.diff().abs().fillna(0)
-        portfolio_returns -= position_changes * transaction_cost
-        
-        cumulative_returns = (1 + portfolio_returns).cumprod()
+        sig = signals.to_numpy(dtype=np.float64)
+        x = spread.to_numpy(dtype=np.float64)
+        if NUMBA_AVAILABLE:
+            # Returns, compounding, Sharpe and drawdown in one compiled pass
+            cr, sharpe, max_drawdown = _bt_core(sig, x, float(transaction_cost), float(risk_free_rate))
+        else:
+            cr, sharpe, max_drawdown = _bt_numpy(sig, x, transaction_cost, risk_free_rate)
         
-        # Sharpe ratio (annualized)
-        mean_ret = portfolio_returns.mean() * 252
-        std_ret = portfolio_returns.std() * np.sqrt(252)
-        sharpe = (mean_ret - risk_free_rate) / std_ret if std_ret != 0 else 0.0
+        cumulative_returns = pd.Series(cr, index=spread.index)
         
-        # Max drawdown
-        peak = cumulative_returns.cummax()
-        drawdown = (cumulative_returns - peak) / peak
-        max_drawdown = drawdown.min()
-        
-        logger.info(f"Backtest completed: Sharpe {sharpe:.2f}, Max Drawdown {max_drawdown:.2%}")
+        # Called once per parameter set in sweeps; only format the message when it is emitted
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Backtest completed: Sharpe {sharpe:.2f}, Max Drawdown {max_drawdown:.2%}")
         return cumulative_returns, sharpe, max_drawdown
     except Exception as e:
         logger.error(f"Error in backtest: {e}")
-        raise
\ No newline at end of file
+        raise
+
+def batch_backtest(
+    spread: Union[pd.Series, np.ndarray],
+    windows: Sequence[int],
+    entry_zs: Sequence[float],
+    exit_zs: Sequence[float],
+    transaction_cost: float = 0.001,
+    risk_free_rate: float = 0.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Grid-search the mean-reversion strategy on one spread: generate signals and backtest every
+    (window, entry_z, exit_z) combination in a single compiled call, parallel over the combinations.
+    Equivalent to calling generate_mean_reversion_signals and backtest_strategy per combination.
+    
+    Args:
+        spread (Union[pd.Series, np.ndarray]): Spread time series.
+        windows (Sequence[int]): Candidate rolling windows.
+        entry_zs (Sequence[float]): Candidate entry z-score thresholds.
+        exit_zs (Sequence[float]): Candidate exit z-score thresholds.
+        transaction_cost (float, optional): Cost per trade (as fraction). Defaults to 0.001.
+        risk_free_rate (float, optional): Annual risk-free rate. Defaults to 0.0.
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Sharpe ratios and max drawdowns, each of shape
+        (len(windows), len(entry_zs), len(exit_zs)).
+    
+    Raises:
+        ValueError: If a parameter grid is empty or a window is invalid.
+        Exception: If the grid search fails.
+    """
+    try:
+        x = np.ascontiguousarray(np.asarray(spread, dtype=np.float64))
+        windows = np.asarray(windows, dtype=np.int64)
+        entry_zs = np.asarray(entry_zs, dtype=np.float64)
+        exit_zs = np.asarray(exit_zs, dtype=np.float64)
+        if windows.size == 0 or entry_zs.size == 0 or exit_zs.size == 0:
+            raise ValueError("Parameter grids must not be empty.")
+        if windows.min() <= 0 or windows.max() > len(x):
+            raise ValueError("Windows must be positive and less than spread length.")
+        
+        sharpe, max_drawdown = _batch_backtest_kernel(
+            x, windows, entry_zs, exit_zs, float(transaction_cost), float(risk_free_rate)
+        )
+        shape = (windows.size, entry_zs.size, exit_zs.size)
+        
+        logger.info(f"Batch backtest completed for {sharpe.size} parameter combinations.")
+        return sharpe.reshape(shape), max_drawdown.reshape(shape)
+    except Exception as e:
+        logger.error(f"Error in batch backtest: {e}")
+        raise
@@ -0,0 +1,8 @@
+# src/utils/__init__.py
+from ._njit import njit, prange, NUMBA_AVAILABLE
+
+__all__ = [
+    'njit',
+    'prange',
+    'NUMBA_AVAILABLE'
+]
@@ -0,0 +1,17 @@
+# src/utils/_njit.py
+# Optional Numba support: when numba is not installed, njit becomes a no-op
+# decorator and prange falls back to range, so kernels still run as plain Python.
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
@@ -0,0 +1,88 @@
+# tests/test_fetch_cache.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import fetch
+from src.strategy import trading
+
+DATES = pd.date_range('2020-01-01', periods=5, freq='B')
+
+
+def _prices(tickers):
+    if isinstance(tickers, str):
+        tickers = [tickers]
+    columns = pd.MultiIndex.from_product([list(tickers), ['Close']])
+    values = np.repeat(np.linspace(100.0, 104.0, len(DATES))[:, None], len(tickers), axis=1)
+    return pd.DataFrame(values, index=DATES, columns=columns)
+
+
+class _FakeDownload:
+    # Stand-in for yf.download that records each request and answers with respond(tickers)
+    def __init__(self):
+        self.calls = []
+        self.respond = _prices
+    
+    def __call__(self, tickers, **kwargs):
+        self.calls.append(tickers)
+        return self.respond(tickers)
+
+
+@pytest.fixture
+def download(tmp_path, monkeypatch):
+    fake = _FakeDownload()
+    monkeypatch.setattr(fetch, 'CACHE_DIR', tmp_path / 'cache')
+    monkeypatch.setattr(fetch.yf, 'download', fake)
+    trading._fetch_index_returns_cached.cache_clear()
+    yield fake
+    trading._fetch_index_returns_cached.cache_clear()
+
+
+def test_empty_download_is_fetched_again(download):
+    download.respond = lambda tickers: pd.DataFrame()
+    for _ in range(2):
+        with pytest.raises(ValueError, match="No valid ticker data"):
+            fetch.fetch_stock_data(['A', 'B'], '2020-01-01', '2020-01-08')
+    assert len(download.calls) == 2
+    assert not list(fetch.CACHE_DIR.glob('*.pkl'))
+
+
+def test_partial_batch_download_is_not_cached(download):
+    download.respond = lambda tickers: pd.DataFrame() if 'C' in tickers else _prices(tickers)
+    for _ in range(2):
+        data = fetch.fetch_stock_data(['A', 'B', 'C', 'D'], '2020-01-01', '2020-01-08', batch_size=2)
+        assert list(data.columns.get_level_values(0).unique()) == ['A', 'B']
+    assert len(download.calls) == 4  # two batches, downloaded on both calls
+    assert not list(fetch.CACHE_DIR.glob('*.pkl'))
+
+
+def test_complete_download_is_served_from_disk(download):
+    first = fetch.fetch_stock_data(['A', 'B', 'C', 'D'], '2020-01-01', '2020-01-08', batch_size=2)
+    second = fetch.fetch_stock_data(['A', 'B', 'C', 'D'], '2020-01-01', '2020-01-08', batch_size=2)
+    assert len(download.calls) == 2  # both batches of the first call only
+    assert len(list(fetch.CACHE_DIR.glob('*.pkl'))) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_empty_index_download_is_retried(download):
+    download.respond = lambda tickers: pd.DataFrame()
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            trading.fetch_index_returns('2020-01-01', '2020-01-08')
+    assert len(download.calls) == 2
+    
+    download.respond = _prices
+    returns = trading.fetch_index_returns('2020-01-01', '2020-01-08')
+    assert len(download.calls) == 3
+    assert len(returns) == len(DATES) - 1
+
+
+def test_stale_empty_cache_entry_is_ignored(download):
+    key = ('stocks', ('A',), '2020-01-01', '2020-01-08', '1d')
+    fetch.CACHE_DIR.mkdir(parents=True)
+    digest = fetch.hashlib.sha1(repr(key).encode()).hexdigest()
+    pd.to_pickle(pd.DataFrame(), fetch.CACHE_DIR / f"{digest}.pkl")
+    
+    data = fetch.fetch_stock_data(['A'], '2020-01-01', '2020-01-08')
+    assert len(download.calls) == 1
+    assert list(data.columns.get_level_values(0).unique()) == ['A']
@@ -0,0 +1,67 @@
+# tests/test_mean_reversion_vectorized.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.strategy import trading
+
+
+def _reference_loop(z: np.ndarray, entry_z: float, exit_z: float) -> np.ndarray:
+    # The original per-bar state machine; NaN z-scores fail every comparison.
+    signals = np.zeros(len(z), dtype=np.int8)
+    position = 0
+    for i, value in enumerate(z):
+        if position == 0:
+            if value > entry_z:
+                signals[i] = -1
+                position = -1
+            elif value < -entry_z:
+                signals[i] = 1
+                position = 1
+        elif position == 1:
+            if value > -exit_z:
+                signals[i] = -1
+                position = 0
+        elif position == -1:
+            if value < exit_z:
+                signals[i] = 1
+                position = 0
+    return signals
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_reference_loop_on_random_z(seed):
+    rng = np.random.default_rng(seed)
+    for trial in range(2000):
+        n = int(rng.integers(0, 150))
+        z = rng.normal(size=n) * rng.choice([0.5, 1.0, 3.0])
+        z[rng.random(n) < 0.15] = np.nan
+        z[rng.random(n) < 0.03] = np.inf
+        z[rng.random(n) < 0.03] = -np.inf
+        entry_z = float(rng.uniform(0.01, 2.0))
+        exit_z = float(rng.uniform(0.001, entry_z)) if trial % 4 else entry_z
+        if trial % 5 == 0:
+            # Values landing exactly on the thresholds
+            z = np.round(z, 1)
+            entry_z = max(round(entry_z, 1), 0.1)
+            exit_z = min(max(round(exit_z, 1), 0.1), entry_z)
+        
+        expected = _reference_loop(z, entry_z, exit_z)
+        result = trading._mean_reversion_vectorized(z, entry_z, exit_z)
+        assert result.dtype == np.int8
+        np.testing.assert_array_equal(result, expected, err_msg=f"trial {trial}: entry_z={entry_z}, exit_z={exit_z}")
+
+
+def test_fallback_matches_fused_kernel(monkeypatch):
+    rng = np.random.default_rng(42)
+    index = pd.date_range('2000-01-01', periods=2000, freq='B')
+    spreads = [pd.Series(rng.normal(0, 0.01, len(index)), index=index) for _ in range(10)]
+    params = [(5, 1.7, 0.35), (20, 2.0, 0.5), (60, 1.3, 1.3)]
+    
+    expected = [
+        [trading.generate_mean_reversion_signals(spread, *p).to_numpy() for p in params] for spread in spreads
+    ]
+    monkeypatch.setattr(trading, 'NUMBA_AVAILABLE', False)
+    for spread, spread_expected in zip(spreads, expected):
+        for p, signals in zip(params, spread_expected):
+            np.testing.assert_array_equal(trading.generate_mean_reversion_signals(spread, *p).to_numpy(), signals)